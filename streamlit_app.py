@@ -1,145 +1,357 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+import httpx
+import orjson
+import ijson
+import asyncio
+import threading
+import time
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import pandas as pd
 from collections import Counter
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
 
 st.set_page_config(page_title="Explorador datos.gob.es", layout="wide")
 
-BASE_URL = "http://datos.gob.es/apidata"
+BASE_URL = "https://datos.gob.es/apidata"
+CACHE_TTL = 600
+CACHE_MAX_ENTRIES = 512
+
+_get_value = itemgetter('_value')
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    # Sesión compartida para reutilizar conexiones (keep-alive) entre peticiones
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                          max_retries=Retry(total=2, backoff_factor=0.2,
+                                            status_forcelist=(500, 502, 503, 504)))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip'})
+    return session
 
 def format_title(title_list):
     if not title_list:
         return "Sin título"
-    return title_list[0].get('_value', 'Sin título')
+    first = title_list[0]
+    return first.get('_value', 'Sin título')
+
+DATE_FORMAT = '%d/%m/%Y %H:%M'
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str):
+    if not isinstance(date_str, str):
+        return None
+    dt = None
+    # Algunos endpoints devuelven ISO-8601 y otros RFC 2822 ("Mon, 01 Jan 2020 ...")
+    if date_str[:1].isdigit():
+        try:
+            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    if dt is None:
+        try:
+            dt = parsedate_to_datetime(date_str)
+        except (TypeError, ValueError):
+            return None
+    # Se conserva la hora publicada sin zona para poder comparar fechas con y sin offset
+    return dt.replace(tzinfo=None)
+
+def parse_date(date_str):
+    # Las fechas se repiten mucho entre datasets; los valores no hashables no se cachean
+    try:
+        return _parse_date_cached(date_str)
+    except TypeError:
+        return None
 
 def format_date(date_str):
+    dt = parse_date(date_str)
+    return dt.strftime(DATE_FORMAT) if dt else date_str
+
+async def _fetch_distribution(client, dataset_id):
+    # None indica un fallo (red, estado HTTP, JSON o estructura inesperada) y no debe
+    # confundirse con "sin distribuciones", que es una tupla vacía
     try:
-        dt = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z%z')
-        return dt.strftime('%d/%m/%Y %H:%M')
-    except:
-        return date_str
+        response = await client.get(f"/catalog/distribution/dataset/{dataset_id}")
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+    except (httpx.HTTPError, orjson.JSONDecodeError):
+        return None
+    result = data.get('result') if type(data) is dict else None
+    items = result.get('items', []) if type(result) is dict else None
+    if type(items) is not list or any(type(dist) is not dict for dist in items):
+        return None
+    return tuple(dist.get('accessURL', '') for dist in items)
+
+async def _fetch_distribution_urls(dataset_ids):
+    # HTTP/2 multiplexa todas las peticiones sobre una única conexión TLS
+    limits = httpx.Limits(max_keepalive_connections=16)
+    async with httpx.AsyncClient(http2=True, base_url=BASE_URL, limits=limits, timeout=10) as client:
+        return await asyncio.gather(
+            *(_fetch_distribution(client, dataset_id) for dataset_id in dataset_ids)
+        )
 
-def get_distribution_urls(dataset_id):
+@st.cache_resource(show_spinner=False)
+def _distribution_cache():
+    # Caché por dataset compartida entre sesiones: dataset_id -> (caducidad, urls)
+    return {}, threading.Lock()
+
+def get_distribution_urls(dataset_ids):
+    """Devuelve las URLs de cada dataset (None si no se pudieron obtener); solo se descargan los que no están en caché."""
+    cache, lock = _distribution_cache()
+    now = time.monotonic()
+    results = {}
+    with lock:
+        for dataset_id in dataset_ids:
+            entry = cache.get(dataset_id)
+            if entry and entry[0] > now:
+                results[dataset_id] = entry[1]
+    
+    missing = [dataset_id for dataset_id in dict.fromkeys(dataset_ids) if dataset_id not in results]
+    if missing:
+        fetched = asyncio.run(_fetch_distribution_urls(missing))
+        with lock:
+            for dataset_id, urls in zip(missing, fetched):
+                results[dataset_id] = urls
+                if urls is None:
+                    # Los fallos no se cachean para reintentarlos en la siguiente búsqueda
+                    continue
+                cache.pop(dataset_id, None)
+                cache[dataset_id] = (now + CACHE_TTL, urls)
+            while len(cache) > CACHE_MAX_ENTRIES:
+                del cache[next(iter(cache))]
+    return tuple(results[dataset_id] for dataset_id in dataset_ids)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_api_request(endpoint, params_items=()):
+    # Los errores se propagan para que st.cache_data no guarde un fallo puntual durante el TTL
+    response = get_session().get(f"{BASE_URL}{endpoint}", params=dict(params_items), timeout=10)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+def make_api_request(endpoint, params_items=()):
     try:
-        response = requests.get(f"{BASE_URL}/catalog/distribution/dataset/{dataset_id}")
-        if response.status_code == 200:
-            data = response.json()
-            return [dist.get('accessURL', '') for dist in data.get('result', {}).get('items', [])]
-    except:
-        return []
-
-def make_api_request(endpoint, params=None):
+        return _cached_api_request(endpoint, params_items)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        st.error(f"Error API: {str(e)}")
+        return None
+
+def stream_api_items(endpoint, params_items=()):
+    """Devuelve un iterador sobre los items de la respuesta, parseados a medida que llegan."""
     url = f"{BASE_URL}{endpoint}"
     try:
-        response = requests.get(url, params=params)
-        return response.json() if response.status_code == 200 else None
-    except Exception as e:
+        response = get_session().get(url, params=dict(params_items), timeout=10, stream=True)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if e.response is not None:
+            e.response.close()
         st.error(f"Error API: {str(e)}")
         return None
+    # Descomprimir gzip antes de que ijson lea el cuerpo
+    response.raw.decode_content = True
+    return _iter_response_items(response)
+
+def _iter_response_items(response):
+    # ijson lee de response.raw, así que los errores de red llegan sin envolver desde urllib3
+    with response:
+        try:
+            yield from ijson.items(response.raw, 'result.items.item')
+        except (ijson.JSONError, requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            st.error(f"Error API: {str(e)}")
+
+def result_items(data):
+    if data and "result" in data and "items" in data["result"]:
+        return data["result"]["items"]
+    return None
+
+def _prefetch_page(prefetched, key):
+    # Solo se marca la página como precargada si la descarga termina bien; ante cualquier
+    # fallo se libera la clave para poder volver a intentarlo
+    try:
+        _cached_api_request(*key)
+    except Exception:
+        prefetched.pop(key, None)
+    else:
+        prefetched[key] = time.monotonic() + CACHE_TTL
+
+def prefetch_next_page(endpoint, params, shown):
+    """Precarga en segundo plano la página siguiente en la caché de make_api_request."""
+    # Una página incompleta es la última: no hay siguiente que precargar
+    if shown < params['_pageSize'] or params['_page'] >= 100:
+        return
+    key = (endpoint, tuple(sorted({**params, '_page': params['_page'] + 1}.items())))
+    # prefetched_pages: clave -> caducidad, o None mientras la descarga está en curso
+    prefetched = st.session_state.setdefault('prefetched_pages', {})
+    if key in prefetched and (prefetched[key] is None or prefetched[key] > time.monotonic()):
+        return
+    prefetched[key] = None
+    thread = threading.Thread(target=_prefetch_page, args=(prefetched, key), daemon=True)
+    # Sin ScriptRunContext st.cache_data descarta el resultado en lugar de guardarlo; el hilo
+    # no debe emitir elementos (de ahí show_spinner=False en las cachés que usa)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+def was_prefetched(endpoint, params_items):
+    expires = st.session_state.get('prefetched_pages', {}).get((endpoint, params_items))
+    return expires is not None and expires > time.monotonic()
 
-def get_dataset_stats(data):
-    if not data or 'result' not in data or 'items' not in data['result']:
-        return {
-            'total_datasets': 0,
-            'unique_formats': 0,
-            'unique_publishers': 0,
-            'common_keywords': {},
-            'date_range': 'N/A'
-        }
+def init_dataset_stats():
+    return {
+        'total': 0,
+        'formats': set(),
+        'publishers': set(),
+        'keywords': Counter(),
+        'dmin': None,
+        'dmax': None
+    }
+
+def update_dataset_stats(acc, item):
+    """Acumula las estadísticas de un item y devuelve la fila a mostrar."""
+    acc['total'] += 1
     
-    items = data['result']['items']
-    formats = []
-    publishers = []
-    keywords = []
-    dates = []
+    # Procesar distribuciones y formatos; orjson e ijson solo producen dict/list/str
+    # nativos, por lo que basta con comparar el tipo exacto
+    distributions = item.get('distribution', [])
+    urls = None
+    if distributions:
+        if type(distributions) is list:
+            for dist in distributions:
+                if type(dist) is dict:
+                    if 'format' in dist:
+                        acc['formats'].add(str(dist['format']))
+                    if 'accessURL' in dist:
+                        if urls is None:
+                            urls = []
+                        urls.append(dist['accessURL'])
+        elif type(distributions) is str:
+            acc['formats'].add(distributions)
     
-    for item in items:
-        # Procesar distribuciones y formatos
-        distributions = item.get('distribution', [])
-        if distributions:
-            if isinstance(distributions, list):
-                for dist in distributions:
-                    if isinstance(dist, dict) and 'format' in dist:
-                        formats.append(str(dist['format']))
-            elif isinstance(distributions, str):
-                formats.append(distributions)
-        
-        # Procesar resto de campos
-        if 'publisher' in item:
-            publishers.append(str(item['publisher']))
-        
-        if 'keyword' in item and isinstance(item['keyword'], list):
-            keywords.extend([k.get('_value', '') for k in item['keyword'] if isinstance(k, dict)])
-        
-        if 'issued' in item:
-            try:
-                dates.append(format_date(item['issued']))
-            except:
-                pass
+    # Procesar resto de campos
+    if 'publisher' in item:
+        acc['publishers'].add(str(item['publisher']))
+    
+    keywords = item.get('keyword', [])
+    if type(keywords) is list:
+        keywords = [_get_value(k) for k in keywords if type(k) is dict and '_value' in k]
+        acc['keywords'].update(keywords)
+    else:
+        keywords = []
     
+    issued = None
+    if item.get('issued'):
+        issued = format_date(item['issued'])
+        issued_dt = parse_date(item['issued'])
+        if issued_dt is not None:
+            if acc['dmin'] is None or issued_dt < acc['dmin']:
+                acc['dmin'] = issued_dt
+            if acc['dmax'] is None or issued_dt > acc['dmax']:
+                acc['dmax'] = issued_dt
+    
+    identifier = item.get('identifier', '')
     return {
-        'total_datasets': len(items),
-        'unique_formats': len(set(formats)),
-        'unique_publishers': len(set(publishers)) if publishers else 0,
-        'common_keywords': dict(Counter(keywords).most_common(5)),
-        'date_range': f"{min(dates, default='N/A')} - {max(dates, default='N/A')}"
+        'title': format_title(item.get('title', [])),
+        'publisher': item.get('publisher'),
+        'identifier': identifier,
+        'dataset_id': identifier.split('/')[-1],
+        'urls': urls,
+        'issued': issued,
+        'description': format_title(item['description']) if item.get('description') else None,
+        'keywords': keywords,
     }
 
-def display_dataset_results(data):
-    if data and "result" in data and "items" in data["result"]:
-        stats = get_dataset_stats(data)
-        
-        metric_cols = st.columns(4)
-        metric_cols[0].metric("Total Datasets", stats['total_datasets'])
-        metric_cols[1].metric("Formatos Únicos", stats['unique_formats'])
-        metric_cols[2].metric("Publicadores", stats['unique_publishers'])
-        
-        if stats['common_keywords']:
-            st.subheader("Palabras clave más comunes")
-            keyword_cols = st.columns(len(stats['common_keywords']))
-            for i, (kw, count) in enumerate(stats['common_keywords'].items()):
-                keyword_cols[i].metric(kw, count)
-        
-        st.divider()
+def get_dataset_stats(acc):
+    return {
+        'total_datasets': acc['total'],
+        'unique_formats': len(acc['formats']),
+        'unique_publishers': len(acc['publishers']),
+        'common_keywords': dict(nlargest(5, acc['keywords'].items(), key=itemgetter(1))),
+        'date_range': f"{acc['dmin']:{DATE_FORMAT}} - {acc['dmax']:{DATE_FORMAT}}" if acc['dmin'] else 'N/A'
+    }
+
+def format_download_urls(urls):
+    # Un único bloque markdown por dataset en lugar de un elemento por URL
+    return "**📊 Descargar datos:**\n" + "\n".join(f"- [{url}]({url})" for url in urls)
+
+def display_dataset_results(items):
+    """Muestra los items a medida que se reciben y devuelve cuántos se han mostrado."""
+    if items is None:
+        st.warning("No se encontraron resultados")
+        return 0
+    
+    metric_cols = st.columns(4)
+    metric_slots = [col.empty() for col in metric_cols]
+    keywords_section = st.container()
+    st.divider()
+    
+    acc = init_dataset_stats()
+    pending = []
+    for item in items:
+        row = update_dataset_stats(acc, item)
+        metric_slots[0].metric("Total Datasets", acc['total'])
         
-        for item in data["result"]["items"]:
-            with st.container():
-                st.markdown(f"### {format_title(item.get('title', []))}")
-                
-                col1, col2 = st.columns([2,1])
-                with col1:
-                    if item.get('publisher'):
-                        st.markdown(f"**Publicador:** {item['publisher']}")
-                    
-                    identifier = item.get('identifier', '')
-                    dataset_id = identifier.split('/')[-1]
-                    
-                    # Mostrar URL del conjunto de datos
-                    st.markdown("**🔗 Acceso a los datos:**")
-                    st.markdown(f"[Ver en datos.gob.es]({identifier})")
-                    
-                    # Mostrar URLs de distribuciones
-                    urls = get_distribution_urls(dataset_id)
-                    if urls:
-                        st.markdown("**📊 Descargar datos:**")
-                        for url in urls:
-                            st.markdown(f"- [{url}]({url})")
-                
-                with col2:
-                    if item.get('issued'):
-                        st.markdown(f"**Fecha:** {format_date(item['issued'])}")
-                
-                if item.get('description'):
-                    with st.expander("Ver descripción"):
-                        st.write(format_title(item.get('description', [])))
+        with st.container():
+            st.markdown(f"### {row['title']}")
+            
+            col1, col2 = st.columns([2,1])
+            with col1:
+                if row['publisher']:
+                    st.markdown(f"**Publicador:** {row['publisher']}")
                 
-                if item.get('keyword'):
-                    st.markdown("**Etiquetas:** " + ", ".join([kw.get('_value', '') for kw in item['keyword']]))
+                # Mostrar URL del conjunto de datos
+                st.markdown(f"**🔗 Acceso a los datos:**  \n[Ver en datos.gob.es]({row['identifier']})")
                 
-                st.divider()
-    else:
+                # Mostrar URLs de distribuciones; las que no vienen en el listado se rellenan al final
+                if row['urls'] is None:
+                    pending.append((row, st.empty()))
+                elif row['urls']:
+                    st.markdown(format_download_urls(row['urls']))
+            
+            with col2:
+                if row['issued']:
+                    st.markdown(f"**Fecha:** {row['issued']}")
+            
+            if row['description']:
+                with st.expander("Ver descripción"):
+                    st.write(row['description'])
+            
+            if row['keywords']:
+                st.markdown("**Etiquetas:** " + ", ".join(row['keywords']))
+            
+            st.divider()
+    
+    if not acc['total']:
         st.warning("No se encontraron resultados")
+        return 0
+    
+    # Obtener en paralelo las URLs de los datasets que no las traen en el listado
+    if pending:
+        fetched = get_distribution_urls(tuple(row['dataset_id'] for row, _ in pending))
+        for (row, slot), urls in zip(pending, fetched):
+            if urls is None:
+                slot.caption("No se pudieron obtener las URLs de descarga")
+            elif urls:
+                slot.markdown(format_download_urls(urls))
+    
+    stats = get_dataset_stats(acc)
+    metric_slots[0].metric("Total Datasets", stats['total_datasets'])
+    metric_slots[1].metric("Formatos Únicos", stats['unique_formats'])
+    metric_slots[2].metric("Publicadores", stats['unique_publishers'])
+    metric_slots[3].metric("Rango de fechas", stats['date_range'])
+    
+    if stats['common_keywords']:
+        with keywords_section:
+            st.subheader("Palabras clave más comunes")
+            st.markdown(" · ".join(f"**{kw}** ({count})" for kw, count in stats['common_keywords'].items()))
+    
+    return acc['total']
 
 def main():
     st.title("🔍 Explorador datos.gob.es")
@@ -173,71 +385,111 @@ def main():
                                     ["-issued", "title", "-title"],
                                     help="Criterio de ordenación de los resultados")
             }
+            # Forma hashable de los parámetros para la caché de respuestas
+            params_items = tuple(sorted(params.items()))
 
         # Campos de búsqueda específicos según la operación
         if dataset_operation == "Buscar por ID":
-            dataset_id = st.text_input("ID del dataset", help="Introduce el identificador único del dataset")
-            if dataset_id and st.button("Buscar", type="primary"):
+            with st.form(key=f"f_{dataset_operation}"):
+                dataset_id = st.text_input("ID del dataset", help="Introduce el identificador único del dataset")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and dataset_id:
                 data = make_api_request(f"/catalog/dataset/{dataset_id}")
-                display_dataset_results(data)
+                display_dataset_results(result_items(data))
 
         elif dataset_operation == "Buscar por título":
-            title = st.text_input("Título", help="Introduce el título o parte del título a buscar")
-            if title and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/title/{title}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                title = st.text_input("Título", help="Introduce el título o parte del título a buscar")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and title:
+                endpoint = f"/catalog/dataset/title/{title}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por publicador":
-            publisher_id = st.text_input("ID del publicador", help="Introduce el ID del publicador")
-            if publisher_id and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/publisher/{publisher_id}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                publisher_id = st.text_input("ID del publicador", help="Introduce el ID del publicador")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and publisher_id:
+                endpoint = f"/catalog/dataset/publisher/{publisher_id}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por tema":
-            theme = st.text_input("Tema", help="Introduce el tema a buscar")
-            if theme and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/theme/{theme}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                theme = st.text_input("Tema", help="Introduce el tema a buscar")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and theme:
+                endpoint = f"/catalog/dataset/theme/{theme}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por formato":
-            format_type = st.text_input("Formato", help="Introduce el formato (ej: csv, json, xml)")
-            if format_type and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/format/{format_type}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                format_type = st.text_input("Formato", help="Introduce el formato (ej: csv, json, xml)")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and format_type:
+                endpoint = f"/catalog/dataset/format/{format_type}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por palabra clave":
-            keyword = st.text_input("Palabra clave", help="Introduce la palabra clave a buscar")
-            if keyword and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/keyword/{keyword}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                keyword = st.text_input("Palabra clave", help="Introduce la palabra clave a buscar")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and keyword:
+                endpoint = f"/catalog/dataset/keyword/{keyword}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por ubicación":
-            col1, col2 = st.columns(2)
-            with col1:
-                spatial_word1 = st.text_input("Palabra espacial 1", help="Ej: Autonomia")
-            with col2:
-                spatial_word2 = st.text_input("Palabra espacial 2", help="Ej: Madrid")
-            if spatial_word1 and spatial_word2 and st.button("Buscar", type="primary"):
-                data = make_api_request(f"/catalog/dataset/spatial/{spatial_word1}/{spatial_word2}", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    spatial_word1 = st.text_input("Palabra espacial 1", help="Ej: Autonomia")
+                with col2:
+                    spatial_word2 = st.text_input("Palabra espacial 2", help="Ej: Madrid")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted and spatial_word1 and spatial_word2:
+                endpoint = f"/catalog/dataset/spatial/{spatial_word1}/{spatial_word2}"
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Buscar por fecha de modificación":
-            col1, col2 = st.columns(2)
-            with col1:
-                begin_date = st.date_input("Fecha inicial", help="Fecha desde la que buscar")
-            with col2:
-                end_date = st.date_input("Fecha final", help="Fecha hasta la que buscar")
-            if st.button("Buscar", type="primary"):
+            with st.form(key=f"f_{dataset_operation}"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    begin_date = st.date_input("Fecha inicial", help="Fecha desde la que buscar")
+                with col2:
+                    end_date = st.date_input("Fecha final", help="Fecha hasta la que buscar")
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted:
                 begin_str = begin_date.strftime("%Y-%m-%dT00:00Z")
                 end_str = end_date.strftime("%Y-%m-%dT23:59Z")
                 endpoint = f"/catalog/dataset/modified/begin/{begin_str}/end/{end_str}"
-                data = make_api_request(endpoint, params)
-                display_dataset_results(data)
+                data = make_api_request(endpoint, params_items)
+                shown = display_dataset_results(result_items(data))
+                prefetch_next_page(endpoint, params, shown)
 
         elif dataset_operation == "Lista completa":
-            if st.button("Buscar", type="primary"):
-                data = make_api_request("/catalog/dataset", params)
-                display_dataset_results(data)
+            with st.form(key=f"f_{dataset_operation}"):
+                submitted = st.form_submit_button("Buscar", type="primary")
+            if submitted:
+                endpoint = "/catalog/dataset"
+                # Si la página ya se precargó se lee de la caché en lugar de volver a descargarla
+                items = None
+                if was_prefetched(endpoint, params_items):
+                    items = result_items(make_api_request(endpoint, params_items))
+                if items is None:
+                    items = stream_api_items(endpoint, params_items)
+                shown = display_dataset_results(items)
+                prefetch_next_page(endpoint, params, shown)
 
 if __name__ == "__main__":
     main()